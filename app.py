@@ -4,13 +4,15 @@ Instrument Server (Unified – Authoritative)
 
 This server acts as the single point of truth for hardware access (TimeTagger and Laser).
 It ensures:
-- Safe, serialized hardware access via a single worker thread (HardwareWorker).
+- Safe hardware access via HardwareWorker: control and status jobs are serialized
+  on a single worker thread; TimeTagger measurements may run concurrently.
 - Parity between REST API and Socket.IO interfaces.
 - Real-time status broadcasting to multiple clients.
 - Configurable, per-client measurement streams.
 
 Architecture:
-- **HardwareWorker**: Owns the physical device objects. executing jobs sequentially from a queue.
+- **HardwareWorker**: Owns the physical device objects. Executes control/status jobs sequentially
+  from a queue; REST measurement jobs (submit(..., concurrent=True)) run on a small thread pool.
 - **Flask Routes**: Handle REST requests, submitting jobs to the worker and waiting for results.
 - **Socket.IO Events**: Handle real-time streaming and configuration.
 - **Validation**: Strict input validation is applied before any logic execution, returning soft errors (200 OK with "status": 400) on failure.
@@ -18,15 +20,23 @@ Architecture:
 
 from __future__ import annotations
 
+import heapq
 import logging
+import math
+import re
 import sys
-import queue
 import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from decimal import Decimal, InvalidOperation
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Any, Callable, Set, Dict, List, Union
 
+import numpy as np
 from flask import Flask, jsonify, request, render_template
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 
 # =================================================
 # ================= DEPENDENCIES ==================
@@ -46,6 +56,10 @@ from matchbox2 import MatchBox2Laser
 app = Flask(__name__)
 CORS(app)
 
+# Streaming tasks block inside TimeTagger C calls (waitUntilFinished), which
+# would stall an eventlet/gevent hub, so stay on threading. Background tasks
+# are still spawned via socketio.start_background_task so they follow
+# async_mode if that changes; only the HardwareWorker is a raw OS thread.
 socketio = SocketIO(
     app,
     cors_allowed_origins="*",
@@ -66,27 +80,52 @@ PRIMES = [
 ]
 
 DEFAULT_COUNTRATE_WINDOW_S = 1.0
+
+# Channel lists "1,2,3" and groups "1,2;3,4". Negative channels are falling
+# edges; empty entries ("1,,2", "1,2,") and empty groups are tolerated.
+_CH_LIST = r"\s*(?:-?\d+)?(?:\s*,\s*(?:-?\d+)?)*\s*"
+CH_RE = re.compile(rf"^{_CH_LIST}$", re.ASCII)
+GROUP_RE = re.compile(rf"^{_CH_LIST}(?:;{_CH_LIST})*$", re.ASCII)
+CHANNEL_RE = re.compile(r"-?\d+", re.ASCII)
+
+# How often the HardwareWorker refreshes its cached laser status
+STATUS_REFRESH_INTERVAL_S = 1.0
+# Threads available to run measurement jobs submitted with concurrent=True
+MEASUREMENT_WORKERS = 4
+# Max jobs waiting on the worker queue
+MAX_QUEUE_DEPTH = 32
+# Max concurrent measurement jobs running or waiting for a pool thread; kept
+# close to the pool size so excess load gets a 503 instead of a timeout
+MAX_INFLIGHT_MEASUREMENTS = 2 * MEASUREMENT_WORKERS
+# How long status routes wait on device init before answering 503
+STATUS_READY_TIMEOUT_S = 1.0
 Job = Callable[[Any], Any]
 
 # =================================================
 # ================= HELPERS =======================
 # =================================================
 
+def _route_args() -> Dict[str, Any]:
+    """Query-string mapping for the current REST request; fetch once per route."""
+    return request.args
+
+
 def validate_arg(name: str, 
                 type_func: Callable, 
-                source: Dict[str, Any] = None, 
+                *,
+                source: Dict[str, Any], 
                 min_val: Union[int, float] = None, 
                 max_val: Union[int, float] = None, 
                 default: Any = None, 
                 required: bool = False) -> Any:
     """
-    Validates an input argument from request.args or a dictionary source.
+    Validates an input argument from a mapping of raw values.
 
     Args:
         name: Parameter name.
         type_func: Function to convert the string input (e.g., int, float).
-        source: Optional dictionary to look up values (for SocketIO messages). 
-                If None, uses request.args.
+        source: Mapping to look up values in: _route_args() for REST routes,
+                the message dict for SocketIO events.
         min_val: Minimum allowed value (inclusive).
         max_val: Maximum allowed value (inclusive).
         default: Default value if parameter is missing.
@@ -98,28 +137,37 @@ def validate_arg(name: str,
     Raises:
         ValueError: If validation fails (missing required, wrong type, out of range).
     """
-    # If source is provided (dict), use it; otherwise default to request.args
-    if source is not None:
-        val_str = source.get(name)
-    else:
-        val_str = request.args.get(name)
+    val_str = source.get(name)
 
     if val_str is None:
         if required:
             raise ValueError(f"{name} param required")
         return default
 
-    try:
-        val = type_func(val_str)
-    except (ValueError, TypeError):
-        raise ValueError(f"{name} must be of type {type_func.__name__}")
+    # Fast path for plain non-negative integers
+    if type_func is int and isinstance(val_str, str) and val_str.isascii() and val_str.isdigit():
+        val = int(val_str)
+    else:
+        try:
+            val = type_func(val_str)
+        except (ValueError, TypeError):
+            raise ValueError(f"{name} must be of type {type_func.__name__}")
 
     # Ensure consistent precision for floats
     if type_func is float:
-        # Check if precision is greater than 1 decimal place
-        if val != round(val, 1):
-             raise ValueError(f"{name} must have at most 1 decimal place")
-        val = round(val, 1)
+        # nan/inf have no decimal point and nan fails every range comparison
+        if not math.isfinite(val):
+            raise ValueError(f"{name} must be a finite number")
+        # Check precision on the decimal value of the input text rather than
+        # comparing val to round(val, 1), which is an FP equality test.
+        # Decimal covers exponent notation ("123e-3") and trailing zeros.
+        text = val_str if isinstance(val_str, str) else repr(val_str)
+        try:
+            exponent = Decimal(text).normalize().as_tuple().exponent
+        except InvalidOperation:
+            exponent = Decimal(repr(val)).normalize().as_tuple().exponent
+        if exponent < -1:
+            raise ValueError(f"{name} must have at most 1 decimal place")
 
     if min_val is not None and val < min_val:
         raise ValueError(f"{name} must be >= {min_val}")
@@ -129,6 +177,59 @@ def validate_arg(name: str,
     return val
 
 
+def validate_channels(name: str,
+                      *,
+                      source: Dict[str, Any],
+                      required: bool = False,
+                      count: int = None) -> List[int]:
+    """
+    Validates a comma-separated channel list (e.g., "1,2,3") from a mapping.
+
+    Args:
+        name: Parameter name.
+        source: Mapping to look up the value in (see validate_arg).
+        required: If True, raises ValueError if the list is missing or empty.
+        count: If set, the exact number of channels required.
+
+    Returns:
+        The channels as a list of ints (empty if missing and not required).
+
+    Raises:
+        ValueError: If the value is malformed or has the wrong number of channels.
+    """
+    val = source.get(name)
+    val_str = "" if val is None else str(val)
+    if not val_str.strip():
+        if required:
+            raise ValueError(f"{name} param required")
+        return []
+
+    if not CH_RE.match(val_str):
+        raise ValueError(f"{name} must be a comma-separated list of channels")
+    channels = list(map(int, CHANNEL_RE.findall(val_str)))
+    if required and not channels:
+        raise ValueError(f"{name} param required")
+
+    if count is not None and len(channels) != count:
+        raise ValueError(f"{name} must contain exactly {count} channels")
+    return channels
+
+
+def validate_groups(name: str, *, source: Dict[str, Any]) -> List[List[int]]:
+    """
+    Validates semicolon-separated channel groups (e.g., "1,2;3,4") from a mapping.
+    Empty groups are ignored.
+
+    Raises:
+        ValueError: If the value is malformed.
+    """
+    val = source.get(name)
+    val_str = "" if val is None else str(val)
+    if not GROUP_RE.match(val_str):
+        raise ValueError(f"{name} must be semicolon-separated lists of channels")
+    return [list(map(int, CHANNEL_RE.findall(g))) for g in val_str.split(";") if g.strip()]
+
+
 @app.errorhandler(ValueError)
 def handle_bad_request(e):
     """
@@ -138,6 +239,15 @@ def handle_bad_request(e):
     return jsonify({"status": 400, "error": str(e)})
 
 
+@app.errorhandler(ResourceWarning)
+def handle_overload(e):
+    """
+    Handle a saturated HardwareWorker (backpressure).
+    Returns a soft 503 so clients can retry later.
+    """
+    return jsonify({"status": 503, "error": str(e)})
+
+
 @app.errorhandler(Exception)
 def handle_exception(e):
     """
@@ -151,19 +261,103 @@ def handle_exception(e):
 # ============== HARDWARE WORKER =================
 # =================================================
 
+class _ResultSlot:
+    """Where the worker writes a job's result; reused across submits."""
+
+    __slots__ = ("event", "value")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+
+
+class LockFreeJobQueue:
+    """
+    Multi-producer, single-consumer job queue.
+
+    Backed by a ``collections.deque``, whose ``append``/``popleft`` are atomic
+    under the GIL, so producers never take a mutex. The single consumer only
+    blocks on an Event when the queue is empty.
+
+    The maxsize bound is checked without a lock, so concurrent producers may
+    overshoot it slightly; it exists to stop unbounded growth, not to be exact.
+    """
+
+    def __init__(self, maxsize: int = MAX_QUEUE_DEPTH):
+        self._items: deque = deque()
+        self._not_empty = threading.Event()
+        self.maxsize = maxsize
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def enqueue(self, job_fn: Job, result_slot: _ResultSlot):
+        """
+        Append a job and wake the consumer.
+
+        Raises:
+            ResourceWarning: If the queue already holds maxsize jobs.
+        """
+        if len(self._items) >= self.maxsize:
+            raise ResourceWarning("Hardware queue full, try again later")
+        self._items.append((job_fn, result_slot))
+        self._not_empty.set()
+
+    def dequeue(self, timeout: float = None) -> Union[tuple, None]:
+        """
+        Pop the next (job_fn, result_slot) pair, blocking while the queue is empty.
+        Returns None if no job arrived within timeout.
+        """
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            # An enqueue racing with clear() is still seen by the next popleft()
+            if not self._not_empty.wait(timeout):
+                return None
+            self._not_empty.clear()
+
+
 class HardwareWorker:
     """
     Owns all hardware objects and executes jobs sequentially in a single background thread.
-    This ensures that hardware access is thread-safe and serialized.
+    This ensures that device configuration and laser access are thread-safe and serialized.
+
+    TimeTagger measurement jobs submitted with concurrent=True instead run on a pool of
+    MEASUREMENT_WORKERS threads: they only create a measurement and wait on it, which
+    the TimeTagger supports from several threads at once.
     """
 
     def __init__(self):
-        self.job_queue = queue.Queue()
+        self.job_queue = LockFreeJobQueue()
+        # Process-wide free list of result slots; request/event handlers run on
+        # short-lived threads, so a per-thread list would never be reused.
+        # deque append/pop are atomic, like LockFreeJobQueue.
+        self._free_slots: deque = deque()
+        # Measurements wait on the hardware, not the CPU; run them off the worker
+        self._measure_pool = ThreadPoolExecutor(
+            max_workers=MEASUREMENT_WORKERS,
+            thread_name_prefix="Measurement"
+        )
+        self._inflight_lock = threading.Lock()
+        self._inflight_measurements = 0
         self.tagger = None
         self.laser = None
         self.stored_power = 0.0
         self.test_enabled_channels: Set[int] = set()
 
+        # Set once the corresponding device has been initialized and its
+        # first status snapshot published
+        self.tagger_ready = threading.Event()
+        self.laser_ready = threading.Event()
+
+        # Status snapshots: written only by the worker thread, read by anyone
+        self._status_lock = threading.Lock()
+        self._latest_laser_status: Dict[str, Any] = None
+        self._latest_tt_status: Dict[str, Any] = None
+        self._next_laser_refresh = 0.0
+
         threading.Thread(
             target=self._run,
             name="HardwareWorker",
@@ -189,42 +383,148 @@ class HardwareWorker:
     def _run(self):
         """Main worker loop."""
         self._init_tagger()
+        self.refresh_timetagger_status()
+        self.tagger_ready.set()
         self._init_laser()
+        self.refresh_laser_status()
+        self.laser_ready.set()
 
         while True:
-            job_fn, result_q = self.job_queue.get()
-            try:
-                result_q.put(job_fn(self))
-            except Exception as exc:
-                logger.exception("Hardware job failed")
-                result_q.put(exc)
+            item = self.job_queue.dequeue(timeout=STATUS_REFRESH_INTERVAL_S)
+            if item is not None:
+                job_fn, slot = item
+                try:
+                    slot.value = job_fn(self)
+                except Exception as exc:
+                    logger.exception("Hardware job failed")
+                    slot.value = exc
+                # Publish test-signal changes before the caller resumes
+                self.refresh_timetagger_status()
+                slot.event.set()
+
+            # Low-priority refresh, run between jobs
+            if time.monotonic() >= self._next_laser_refresh:
+                self.refresh_laser_status()
+
+    def refresh_laser_status(self):
+        """Re-read the laser and update the cached snapshot. Worker thread only."""
+        self._next_laser_refresh = time.monotonic() + STATUS_REFRESH_INTERVAL_S
+        try:
+            r = self.laser.get_laser_readings()
+        except Exception as exc:
+            logger.warning(f"Laser status refresh failed: {exc}")
+            return
+        self.publish_laser_status(r)
 
-    def submit(self, job_fn: Job, timeout: float = 5.0) -> Any:
+    def publish_laser_status(self, r) -> Dict[str, Any]:
+        """
+        Update the cached snapshot from laser readings already taken.
+        Worker thread only.
+
+        Returns:
+            The published status.
+        """
+        self._next_laser_refresh = time.monotonic() + STATUS_REFRESH_INTERVAL_S
+
+        # Sync: If physical laser is OFF, force stored_power to 0.0
+        # This handles cases where laser was turned off manually/externally
+        if r.power_state == "OFF":
+            self.stored_power = 0.0
+
+        status = {"status": 200, **r.__dict__, "power": self.stored_power}
+        with self._status_lock:
+            self._latest_laser_status = status
+        return status
+
+    def refresh_timetagger_status(self):
+        """Update the cached TimeTagger snapshot. Worker thread only."""
+        status = {"status": 200, "test_enabled_channels": sorted(self.test_enabled_channels)}
+        with self._status_lock:
+            self._latest_tt_status = status
+
+    def laser_status(self) -> Union[Dict[str, Any], None]:
+        """Latest cached laser status, or None if not yet available."""
+        with self._status_lock:
+            return self._latest_laser_status
+
+    def timetagger_status(self) -> Union[Dict[str, Any], None]:
+        """Latest cached TimeTagger status, or None if not yet available."""
+        with self._status_lock:
+            return self._latest_tt_status
+
+    def submit(self, job_fn: Job, timeout: float = 5.0, concurrent: bool = False) -> Any:
         """
         Submit a job to the hardware thread and block until completion.
 
         Args:
             job_fn: A callable that takes 'self' (HardwareWorker instance) as argument.
             timeout: Max time to wait for the job to complete.
+            concurrent: Run the job on the measurement pool instead of the
+                        serialized worker thread. Use for TimeTagger measurements
+                        that only create a measurement and wait on it, so
+                        status/control jobs don't queue behind them.
 
         Returns:
             The return value of job_fn.
 
         Raises:
             TimeoutError: If the job takes longer than timeout.
+            ResourceWarning: If MAX_QUEUE_DEPTH jobs (MAX_INFLIGHT_MEASUREMENTS
+                             for concurrent jobs) are already pending.
             Exception: Re-raises any exception that occurred within the job.
         """
-        q = queue.Queue(maxsize=1)
-        self.job_queue.put((job_fn, q))
+        if concurrent:
+            return self._submit_concurrent(job_fn, timeout)
+
         try:
-            result = q.get(timeout=timeout)
-        except queue.Empty:
+            slot = self._free_slots.pop()
+        except IndexError:
+            slot = _ResultSlot()
+        slot.event.clear()
+
+        try:
+            self.job_queue.enqueue(job_fn, slot)
+        except ResourceWarning:
+            self._free_slots.append(slot)
+            raise
+        if not slot.event.wait(timeout):
+            # The worker may still write to this slot later, so don't reuse it
             raise TimeoutError("Hardware job timed out")
 
+        result = slot.value
+        slot.value = None
+        self._free_slots.append(slot)
+
         if isinstance(result, Exception):
             raise result
         return result
 
+    def _submit_concurrent(self, job_fn: Job, timeout: float) -> Any:
+        """Run a measurement job on the measurement pool and wait for it."""
+        # Queued jobs implicitly wait for device init; do the same here.
+        # Time spent waiting counts against the caller's timeout.
+        deadline = time.monotonic() + timeout
+        if not self.tagger_ready.wait(timeout):
+            raise TimeoutError("Hardware job timed out")
+
+        with self._inflight_lock:
+            if self._inflight_measurements >= MAX_INFLIGHT_MEASUREMENTS:
+                raise ResourceWarning("Too many measurements in progress, try again later")
+            self._inflight_measurements += 1
+
+        future = self._measure_pool.submit(job_fn, self)
+        future.add_done_callback(self._measurement_done)
+        try:
+            return future.result(max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            # Don't start a measurement nobody is waiting for any more
+            future.cancel()
+            raise TimeoutError("Hardware job timed out")
+
+    def _measurement_done(self, _future):
+        with self._inflight_lock:
+            self._inflight_measurements -= 1
+
 
 # Singleton hardware worker instance
 hw = HardwareWorker()
@@ -250,9 +550,9 @@ def timetagger_testing():
         enable (int): 1 to enable, 0 to disable (default 0).
         ch (str): Comma-separated list of channels (e.g., "1,2").
     """
-    enable = validate_arg("enable", int, min_val=0, max_val=1, default=0) != 0
-    val_str = request.args.get("ch", "")
-    channels = [int(x) for x in val_str.split(",") if x.strip()]
+    args = _route_args()
+    enable = validate_arg("enable", int, source=args, min_val=0, max_val=1, default=0) != 0
+    channels = validate_channels("ch", source=args)
 
     def job(hw):
         t = hw.tagger
@@ -284,12 +584,11 @@ def timetagger_testing():
 @app.route("/timetagger/status")
 def timetagger_status():
     """Return current status of TimeTagger (test signals)."""
-    return jsonify(hw.submit(
-        lambda hw: {
-            "status": 200,
-            "test_enabled_channels": sorted(hw.test_enabled_channels)
-        }
-    ))
+    ready = hw.tagger_ready.wait(STATUS_READY_TIMEOUT_S)
+    status = hw.timetagger_status() if ready else None
+    if status is None:
+        return jsonify({"status": 503, "error": "TimeTagger still initializing"})
+    return jsonify(status)
 
 # =================================================
 # ================= TIMETAGGER REST ===============
@@ -303,8 +602,9 @@ def timetagger_countrate():
         ch (str): Comma-separated channels.
         rtime (float): Integration time in seconds (0.1 to 5.0).
     """
-    channels = [int(x) for x in request.args.get("ch", "").split(",") if x.strip()]
-    rtime = validate_arg("rtime", float, min_val=0.1, max_val=5.0, default=DEFAULT_COUNTRATE_WINDOW_S)
+    args = _route_args()
+    channels = validate_channels("ch", source=args)
+    rtime = validate_arg("rtime", float, source=args, min_val=0.1, max_val=5.0, default=DEFAULT_COUNTRATE_WINDOW_S)
 
     def job(hw):
         with Countrate(hw.tagger, channels) as cr:
@@ -313,10 +613,10 @@ def timetagger_countrate():
             return {
                 "status": 200,
                 "recording_time": rtime,
-                "channel_click_rate": dict(zip(channels, map(int, cr.getData())))
+                "channel_click_rate": dict(zip(channels, cr.getData().astype(np.int64).tolist()))
             }
 
-    return jsonify(hw.submit(job))
+    return jsonify(hw.submit(job, concurrent=True))
 
 
 @app.route("/timetagger/coincidence")
@@ -328,12 +628,10 @@ def timetagger_coincidence():
         cwin (int): Coincidence window in ps (1000 to 10000).
         rtime (float): Integration time in seconds (0.1 to 5.0).
     """
-    groups = [
-        [int(x) for x in g.split(",") if x.strip()]
-        for g in request.args.get("groups", "").split(";") if g.strip()
-    ]
-    cwin = validate_arg("cwin", int, min_val=1000, max_val=10000, default=1000)
-    rtime = validate_arg("rtime", float, min_val=0.1, max_val=5.0, default=1.0)
+    args = _route_args()
+    groups = validate_groups("groups", source=args)
+    cwin = validate_arg("cwin", int, source=args, min_val=1000, max_val=10000, default=1000)
+    rtime = validate_arg("rtime", float, source=args, min_val=0.1, max_val=5.0, default=1.0)
 
     def job(hw):
         with Coincidences(hw.tagger, groups, cwin) as co:
@@ -344,12 +642,12 @@ def timetagger_coincidence():
                 return {
                     "status": 200,
                     "virtual_groups": groups,
-                    "coincidence_click_rate": list(map(int, cr.getData())),
+                    "coincidence_click_rate": cr.getData().astype(np.int64).tolist(),
                     "recording_time": rtime,
                     "coincidence_window": cwin * 1e-12
                 }
 
-    return jsonify(hw.submit(job))
+    return jsonify(hw.submit(job, concurrent=True))
 
 
 @app.route("/timetagger/correlation")
@@ -362,10 +660,11 @@ def timetagger_correlation():
         nbins (int): Number of bins (10 to 100).
         rtime (float): Integration time in seconds (0.1 to 5.0).
     """
-    ch1, ch2 = map(int, request.args["ch"].split(","))
-    bwidth = validate_arg("bwidth", int, min_val=1000, max_val=10000, required=True)
-    nbins = validate_arg("nbins", int, min_val=10, max_val=100, required=True)
-    rtime = validate_arg("rtime", float, min_val=0.1, max_val=5.0, required=True)
+    args = _route_args()
+    ch1, ch2 = validate_channels("ch", source=args, required=True, count=2)
+    bwidth = validate_arg("bwidth", int, source=args, min_val=1000, max_val=10000, required=True)
+    nbins = validate_arg("nbins", int, source=args, min_val=10, max_val=100, required=True)
+    rtime = validate_arg("rtime", float, source=args, min_val=0.1, max_val=5.0, required=True)
 
     def job(hw):
         corr = Correlation(hw.tagger, ch1, ch2, bwidth, nbins)
@@ -379,7 +678,7 @@ def timetagger_correlation():
             "window_sec": (bwidth * nbins) * 1e-12
         }
 
-    return jsonify(hw.submit(job))
+    return jsonify(hw.submit(job, concurrent=True))
 
 # =================================================
 # =================== LASER REST ==================
@@ -393,12 +692,13 @@ def laser_control():
         switch (int): 1 to turn ON, 0 to turn OFF.
         power (float): Optical power in mW (1.0 to 5.0). Only applied if switch=1.
     """
-    switch = validate_arg("switch", int, min_val=0, max_val=1, required=True)
-    has_power_param = request.args.get("power") is not None
+    args = _route_args()
+    switch = validate_arg("switch", int, source=args, min_val=0, max_val=1, required=True)
+    has_power_param = args.get("power") is not None
     
     power_val = 1.0
     if switch == 1 and has_power_param:
-        power_val = validate_arg("power", float, min_val=1.0, max_val=5.0, default=1.0)
+        power_val = validate_arg("power", float, source=args, min_val=1.0, max_val=5.0, default=1.0)
 
     def job(hw):
         if switch == 0:
@@ -416,8 +716,10 @@ def laser_control():
             hw.laser.set_laser_on()
             hw.stored_power = power_val
             
-        r = hw.laser.get_laser_readings()
-        return {"status": 200, "power_state": r.power_state, "power": hw.stored_power}
+        # Publish the new state to status readers right away, and answer
+        # from the same readings
+        status = hw.publish_laser_status(hw.laser.get_laser_readings())
+        return {"status": 200, "power_state": status["power_state"], "power": status["power"]}
 
     return jsonify(hw.submit(job))
 
@@ -425,193 +727,286 @@ def laser_control():
 @app.route("/laser/status")
 def laser_status():
     """Get current laser readings."""
-    return jsonify(hw.submit(laser_status_job))
+    ready = hw.laser_ready.wait(STATUS_READY_TIMEOUT_S)
+    # The snapshot can still be missing if the first laser read failed
+    status = hw.laser_status() if ready else None
+    if status is None:
+        return jsonify({"status": 503, "error": "Laser still initializing"})
+    return jsonify(status)
 
 # =================================================
 # ============== SHARED STATUS SOCKETS ============
 # =================================================
 
-laser_clients = 0
-timetagger_clients = 0
+# Connected sids per status namespace. Single set add/discard and len() are
+# atomic under the GIL; the locks only order Event set()/clear() against them.
+laser_clients: Set[str] = set()
+timetagger_clients: Set[str] = set()
 laser_lock = threading.Lock()
 tt_lock = threading.Lock()
 
-def laser_status_job(hw):
-    r = hw.laser.get_laser_readings()
-    # Sync: If physical laser is OFF, force stored_power to 0.0
-    # This handles cases where laser was turned off manually/externally
-    if r.power_state == "OFF":
-        hw.stored_power = 0.0
-        
-    return {"status": 200, **r.__dict__, "power": hw.stored_power}
-
-def timetagger_status_job(hw):
-    return {"status": 200, "test_enabled_channels": sorted(hw.test_enabled_channels)}
+# Set while at least one client is connected to the respective namespace
+laser_has_clients = threading.Event()
+tt_has_clients = threading.Event()
 
-def laser_broadcaster():
-    """Background thread to broadcast laser status to connected clients."""
-    while True:
-        with laser_lock:
-            if laser_clients == 0:
-                socketio.sleep(0.5)
-                continue
-
-        try:
-            data = hw.submit(laser_status_job, 2.0)
-            socketio.emit(
-                "laser_status",
-                data,
-                namespace="/ws/laser/status"
-            )
-            socketio.sleep(1.0)
-
-            
+# Wakes the idle status broadcaster when any status client connects
+status_clients_changed = threading.Event()
 
-        except TimeoutError:
-            # Hardware still initializing or busy — retry quietly
-            socketio.sleep(0.5)
+# (event, namespace, has_clients, snapshot getter, interval in seconds)
+STATUS_STREAMS = [
+    ("laser_status", "/ws/laser/status", laser_has_clients, hw.laser_status, 1.0),
+    ("timetagger_status", "/ws/timetagger/status", tt_has_clients, hw.timetagger_status, 1.0),
+]
 
-        except Exception as exc:
-            logger.warning(f"Laser broadcaster error: {exc}")
-            socketio.sleep(1.0)
+def status_broadcaster():
+    """
+    Background task broadcasting laser and TimeTagger status to connected clients.
+    A heap of (next_due, stream index) schedules each stream at its own cadence.
+    """
+    schedule = [(0.0, i) for i in range(len(STATUS_STREAMS))]
+    heapq.heapify(schedule)
 
-def timetagger_broadcaster():
-    """Background thread to broadcast TimeTagger status to connected clients."""
     while True:
-        with tt_lock:
-            if timetagger_clients == 0:
-                socketio.sleep(0.5)
-                continue
-
-        try:
-            data = hw.submit(timetagger_status_job, 2.0)
-            socketio.emit(
-                "timetagger_status",
-                data,
-                namespace="/ws/timetagger/status"
-            )
-            socketio.sleep(1.0)
-
-        except TimeoutError:
-            socketio.sleep(0.5)
-
-        except Exception as exc:
-            logger.warning(f"TimeTagger broadcaster error: {exc}")
-            socketio.sleep(1.0)
+        status_clients_changed.clear()
+        if not any(stream[2].is_set() for stream in STATUS_STREAMS):
+            status_clients_changed.wait()
+            continue
 
-# Start broadcaster threads
-threading.Thread(target=laser_broadcaster, daemon=True).start()
-threading.Thread(target=timetagger_broadcaster, daemon=True).start()
+        due, i = heapq.heappop(schedule)
+        delay = due - time.monotonic()
+        if delay > 0:
+            socketio.sleep(delay)
+
+        event, namespace, has_clients, snapshot, interval = STATUS_STREAMS[i]
+        next_due = time.monotonic() + interval
+        if has_clients.is_set():
+            data = snapshot()
+            if data is None:
+                # Hardware still initializing — retry quietly
+                next_due = time.monotonic() + 0.5
+            else:
+                try:
+                    socketio.emit(event, data, namespace=namespace)
+                except Exception as exc:
+                    logger.warning(f"Status broadcaster error ({event}): {exc}")
+
+        heapq.heappush(schedule, (next_due, i))
+
+# Start broadcaster task
+socketio.start_background_task(status_broadcaster)
 
 # ---------- Connection Handlers ----------
 
 @socketio.on("connect", namespace="/ws/laser/status")
 def laser_connect():
-    global laser_clients
+    laser_clients.add(request.sid)
     with laser_lock:
-        laser_clients += 1
+        laser_has_clients.set()
+    status_clients_changed.set()
     emit("connected")
 
 @socketio.on("disconnect", namespace="/ws/laser/status")
 def laser_disconnect():
-    global laser_clients
+    laser_clients.discard(request.sid)
     with laser_lock:
-        laser_clients = max(0, laser_clients - 1)
+        if not laser_clients:
+            laser_has_clients.clear()
 
 @socketio.on("connect", namespace="/ws/timetagger/status")
 def tt_connect():
-    global timetagger_clients
+    timetagger_clients.add(request.sid)
     with tt_lock:
-        timetagger_clients += 1
+        tt_has_clients.set()
+    status_clients_changed.set()
     emit("connected")
 
 @socketio.on("disconnect", namespace="/ws/timetagger/status")
 def tt_disconnect():
-    global timetagger_clients
+    timetagger_clients.discard(request.sid)
     with tt_lock:
-        timetagger_clients = max(0, timetagger_clients - 1)
+        if not timetagger_clients:
+            tt_has_clients.clear()
 
 # =================================================
-# ========== GENERIC PER-CLIENT STREAM BASE =======
+# ========== GENERIC GROUPED STREAM BASE ==========
 # =================================================
 
-def start_stream(store, lock, sid, worker_fn):
+class StreamGroups:
+    """
+    Groups clients of one stream namespace by their configured parameters.
+
+    Every unique configuration (key) has one group, backed by a Socket.IO room:
+    one measurement serves the whole group and is emitted once to its room, so
+    hardware and serialization work scale with distinct configurations rather
+    than with clients. The first client to join a key creates the group and
+    starts its worker (if any) with the group state; the last one to leave
+    sets the group's stop event.
+
+    ``groups`` maps key -> group state and is copy-on-write: readers take the
+    current dict once and use it without locking, writers publish a new dict
+    with a single (atomic) reference assignment. ``lock`` only serializes the
+    writers.
     """
-    Start a dedicated streaming thread for a client.
-    
-    Args:
-        store: Dictionary storing client state.
-        lock: Lock protecting the store.
-        sid: Session ID of the client.
-        worker_fn: The worker function to run in a thread.
-    """
-    with lock:
-        store[sid] = {
-            "params": None,
-            "version": 0,
-            "stop": threading.Event()
-        }
-        threading.Thread(
-            target=worker_fn,
-            args=(sid,),
-            daemon=True
-        ).start()
 
-def stop_stream(store, lock, sid):
-    """Stop the streaming thread for a client."""
-    with lock:
-        state = store.pop(sid, None)
-        if state:
-            state["stop"].set()
+    def __init__(self, name: str, namespace: str, worker_fn: Callable = None):
+        self.name = name
+        self.namespace = namespace
+        self.groups: Dict[tuple, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        # Set whenever a group is created; lets shared workers sleep when idle
+        self.changed = threading.Event()
+        self._worker_fn = worker_fn
+        self._keys: Dict[str, tuple] = {}  # sid -> key, guarded by lock
+        self._connected: Set[str] = set()  # guarded by lock
+
+    def connect(self, sid: str):
+        """Register a connected client; call from the namespace's connect handler."""
+        with self.lock:
+            self._connected.add(sid)
+
+    def join(self, sid: str, key: tuple, params: Dict[str, Any], payload_template: Dict[str, Any]):
+        """
+        Move a client into the group for key, leaving its previous group.
+
+        Args:
+            sid: Session ID of the client.
+            key: Canonical, hashable form of the stream parameters.
+            params: Parsed parameters, used if the group has to be created.
+            payload_template: Emit payload with the constant fields filled in;
+                              workers only update the measured fields per tick.
+        """
+        with self.lock:
+            # Late configure from a client that has already disconnected
+            if sid not in self._connected:
+                return
+            old_key = self._keys.get(sid)
+            if old_key == key:
+                return
+            if old_key is not None:
+                self._leave_locked(sid, old_key)
+
+            group = self.groups.get(key)
+            created = group is None
+            if created:
+                group = {
+                    "room": f"{self.name}:{key}",
+                    "params": params,
+                    "payload_template": payload_template,
+                    "sids": frozenset(),
+                    "stop": threading.Event()
+                }
+            self.groups = {**self.groups, key: {**group, "sids": group["sids"] | {sid}}}
+            self._keys[sid] = key
+            join_room(group["room"], sid=sid, namespace=self.namespace)
+
+            if created:
+                self.changed.set()
+                if self._worker_fn is not None:
+                    socketio.start_background_task(self._worker_fn, group)
+
+    def leave(self, sid: str):
+        """Remove a client from its group, stopping the group if it was the last member."""
+        with self.lock:
+            self._connected.discard(sid)
+            key = self._keys.get(sid)
+            if key is not None:
+                self._leave_locked(sid, key)
+
+    def _leave_locked(self, sid: str, key: tuple):
+        del self._keys[sid]
+        group = self.groups[key]
+        leave_room(group["room"], sid=sid, namespace=self.namespace)
+
+        groups = dict(self.groups)
+        sids = group["sids"] - {sid}
+        if sids:
+            groups[key] = {**group, "sids": sids}
+        else:
+            del groups[key]
+            group["stop"].set()
+        self.groups = groups
 
 # =================================================
 # ========== COUNTRATE SOCKET =====================
 # =================================================
 
-countrate_clients = {}
-countrate_lock = threading.Lock()
+class CountrateAggregator:
+    """
+    Runs one shared Countrate over the union of all configured channels and
+    fans the per-group slices out to the countrate rooms.
 
-def countrate_worker(sid):
-    """Worker thread for streaming countrates to a single client."""
-    state = countrate_clients[sid]
-    while not state["stop"].is_set():
-        if not state["params"]:
-            socketio.sleep(0.1)
-            continue
+    The integration time of the shared measurement is the smallest configured
+    rtime. Each group accumulates its channels' counts over consecutive ticks
+    and is sent the average rate once its own rtime has been integrated, so a
+    slow group still gets a rate over (at least) the full window it asked for.
+    """
 
-        ch = state["params"]["ch"]
-        rtime = state["params"]["rtime"]
-        version = state["version"]
-        channels = [int(x) for x in ch.split(",") if x.strip()]
+    def __init__(self, groups: StreamGroups):
+        self._groups = groups
+        # key -> (integrated ps, {ch: sum of rate * ps}); aggregator task only.
+        # Integer picoseconds keep the rtime comparison exact across ticks.
+        self._acc: Dict[tuple, tuple] = {}
 
-        if hw.tagger is None:
-            socketio.sleep(0.5)
-            continue
-            
-        try:
-             with Countrate(hw.tagger, channels) as cr:
-                cr.startFor(int(rtime * 1e12))
-                cr.waitUntilFinished()
-                data = dict(zip(channels, map(int, cr.getData())))
-        except Exception as e:
-            logger.warning(f"Countrate worker error: {e}")
-            socketio.sleep(1.0)
-            continue
+        socketio.start_background_task(self._run)
 
-        # Check if configuration changed while we were measuring
-        if version != state["version"]:
-            continue
+    def _run(self):
+        while True:
+            self._groups.changed.clear()
+            groups = self._groups.groups
+            channels = sorted(set().union(*(g["params"]["channels"] for g in groups.values())))
+            if not channels:
+                self._acc = {}
+                self._groups.changed.wait()
+                continue
 
-        socketio.emit(
-            "countrate",
-            {"status": 200, "rates": data, "ch": ch, "rtime": rtime},
-            namespace="/ws/timetagger/countrate",
-            to=sid
-        )
+            duration_ps = min(g["params"]["duration_ps"] for g in groups.values())
+
+            hw.tagger_ready.wait()
+
+            try:
+                with Countrate(hw.tagger, channels) as cr:
+                    cr.startFor(duration_ps)
+                    cr.waitUntilFinished()
+                    rates = dict(zip(channels, cr.getData().astype(np.int64).tolist()))
+            except Exception as e:
+                logger.warning(f"Countrate aggregator error: {e}")
+                socketio.sleep(1.0)
+                continue
+
+            self._fan_out(rates, duration_ps)
+
+    def _fan_out(self, rates: Dict[int, int], duration_ps: int):
+        """Add one tick to every group and send those whose rtime has elapsed."""
+        acc = {}
+
+        for key, group in self._groups.groups.items():
+            p = group["params"]
+            # Skip groups created mid-measurement on channels not yet measured
+            if any(ch not in rates for ch in p["channels"]):
+                continue
+            elapsed_ps, sums = self._acc.get(key, (0, {}))
+            elapsed_ps += duration_ps
+            sums = {ch: sums.get(ch, 0) + rates[ch] * duration_ps for ch in p["channels"]}
+
+            if elapsed_ps < p["duration_ps"]:
+                acc[key] = (elapsed_ps, sums)
+                continue
+
+            # Only rates change per emit
+            payload = group["payload_template"]
+            payload["rates"] = {ch: round(total / elapsed_ps) for ch, total in sums.items()}
+            socketio.emit("countrate", payload, namespace=self._groups.namespace, to=group["room"])
+
+        self._acc = acc
+
+countrate_groups = StreamGroups("cr", "/ws/timetagger/countrate")
+
+# Singleton shared countrate measurement
+countrate_aggregator = CountrateAggregator(countrate_groups)
 
 @socketio.on("connect", namespace="/ws/timetagger/countrate")
 def cr_connect():
-    start_stream(countrate_clients, countrate_lock, request.sid, countrate_worker)
+    countrate_groups.connect(request.sid)
     emit("connected")
 
 @socketio.on("configure", namespace="/ws/timetagger/countrate")
@@ -621,18 +1016,25 @@ def cr_config(msg):
     Expected msg: {"ch": "1,2", "rtime": 1.0}
     """
     try:
-        # Validate inputs
+        # Validate and parse inputs once, here rather than per measurement
         try:
+            ch = msg.get("ch", "")
+            channels = validate_channels("ch", source=msg)
             rtime = validate_arg("rtime", float, source=msg, min_val=0.1, max_val=5.0, default=DEFAULT_COUNTRATE_WINDOW_S)
         except ValueError as e:
             emit("configured", {"status": 400, "error": str(e)})
             return
 
-        with countrate_lock:
-            s = countrate_clients[request.sid]
-            # Store parameters
-            s["params"] = {"ch": msg.get("ch", ""), "rtime": rtime}
-            s["version"] += 1
+        countrate_groups.join(
+            request.sid,
+            (tuple(channels), rtime),
+            {
+                "channels": channels,
+                "rtime": rtime,
+                "duration_ps": int(rtime * 1e12)
+            },
+            payload_template={"status": 200, "rates": None, "ch": ch, "rtime": rtime}
+        )
         emit("configured", {"status": 200})
     except Exception as e:
         logger.exception("Error in countrate configure")
@@ -640,55 +1042,57 @@ def cr_config(msg):
 
 @socketio.on("disconnect", namespace="/ws/timetagger/countrate")
 def cr_disconnect():
-    stop_stream(countrate_clients, countrate_lock, request.sid)
+    countrate_groups.leave(request.sid)
 
 # =================================================
 # ========== COINCIDENCE SOCKET ===================
 # =================================================
 
-coincidence_clients = {}
-coincidence_lock = threading.Lock()
-
-def coincidence_worker(sid):
-    """Worker thread for streaming coincidence rates."""
-    state = coincidence_clients[sid]
-    while not state["stop"].is_set():
-        if not state["params"]:
-            socketio.sleep(0.1)
-            continue
-
-        p = state["params"]
-        version = state["version"]
+def coincidence_worker(group):
+    """Worker task streaming coincidence rates to one configuration group."""
+    p, stop, room = group["params"], group["stop"], group["room"]
+    payload = group["payload_template"]
+    # Coincidences/Countrate are built once and kept alive across ticks;
+    # they are only rebuilt after a measurement error
+    measurements = ExitStack()
+    cr = None
+
+    # Stay stoppable while the TimeTagger initializes (or if it never does)
+    while not hw.tagger_ready.wait(0.5):
+        if stop.is_set():
+            return
+    try:
+        while not stop.is_set():
+            try:
+                if cr is None:
+                    measurements = ExitStack()
+                    co = measurements.enter_context(Coincidences(hw.tagger, p["groups"], p["cwin"]))
+                    cr = measurements.enter_context(Countrate(hw.tagger, list(co.getChannels())))
 
-        if hw.tagger is None:
-            socketio.sleep(0.5)
-            continue
+                cr.startFor(p["duration_ps"])
+                cr.waitUntilFinished()
+                data = cr.getData().astype(np.int64).tolist()
+            except Exception as e:
+                logger.warning(f"Coincidence worker error: {e}")
+                measurements.close()
+                cr = None
+                socketio.sleep(1.0)
+                continue
 
-        try:
-            with Coincidences(hw.tagger, p["groups"], p["cwin"]) as co:
-                vchs = list(co.getChannels())
-                with Countrate(hw.tagger, vchs) as cr:
-                    cr.startFor(int(p["rtime"] * 1e12))
-                    cr.waitUntilFinished()
-                    data = list(map(int, cr.getData()))
-        except Exception as e:
-            logger.warning(f"Coincidence worker error: {e}")
-            socketio.sleep(1.0)
-            continue
+            # The last client may have left while we were measuring
+            if stop.is_set():
+                break
 
-        if version != state["version"]:
-            continue
+            payload["rates"] = data
+            socketio.emit("coincidence", payload, namespace=coincidence_groups.namespace, to=room)
+    finally:
+        measurements.close()
 
-        socketio.emit(
-            "coincidence",
-            {"status": 200, **p, "rates": data},
-            namespace="/ws/timetagger/coincidence",
-            to=sid
-        )
+coincidence_groups = StreamGroups("co", "/ws/timetagger/coincidence", coincidence_worker)
 
 @socketio.on("connect", namespace="/ws/timetagger/coincidence")
 def co_connect():
-    start_stream(coincidence_clients, coincidence_lock, request.sid, coincidence_worker)
+    coincidence_groups.connect(request.sid)
     emit("connected")
 
 @socketio.on("configure", namespace="/ws/timetagger/coincidence")
@@ -699,24 +1103,30 @@ def co_config(msg):
     """
     try:
         try:
-            groups = [
-                [int(x) for x in g.split(",") if x.strip()]
-                for g in msg.get("groups", "").split(";") if g.strip()
-            ]
+            groups = validate_groups("groups", source=msg)
             cwin = validate_arg("cwin", int, source=msg, min_val=1000, max_val=10000, default=1000)
             rtime = validate_arg("rtime", float, source=msg, min_val=0.1, max_val=5.0, default=1.0)
         except ValueError as e:
             emit("configured", {"status": 400, "error": str(e)})
             return
 
-        with coincidence_lock:
-            s = coincidence_clients[request.sid]
-            s["params"] = {
+        coincidence_groups.join(
+            request.sid,
+            (tuple(map(tuple, groups)), cwin, rtime),
+            {
                 "groups": groups,
                 "cwin": cwin,
-                "rtime": rtime
+                "rtime": rtime,
+                "duration_ps": int(rtime * 1e12)
+            },
+            payload_template={
+                "status": 200,
+                "groups": groups,
+                "cwin": cwin,
+                "rtime": rtime,
+                "rates": None
             }
-            s["version"] += 1
+        )
         emit("configured", {"status": 200})
     except Exception as e:
         logger.exception("Error in coincidence configure")
@@ -724,54 +1134,64 @@ def co_config(msg):
 
 @socketio.on("disconnect", namespace="/ws/timetagger/coincidence")
 def co_disconnect():
-    stop_stream(coincidence_clients, coincidence_lock, request.sid)
+    coincidence_groups.leave(request.sid)
 
 # =================================================
 # ========== CORRELATION SOCKET ===================
 # =================================================
 
-correlation_clients = {}
-correlation_lock = threading.Lock()
-
-def correlation_worker(sid):
-    """Worker thread for streaming correlation histograms."""
-    state = correlation_clients[sid]
-    while not state["stop"].is_set():
-        if not state["params"]:
-            socketio.sleep(0.1)
-            continue
-
-        p = state["params"]
-        version = state["version"]
-
-        if hw.tagger is None:
-            socketio.sleep(0.5)
-            continue
+def correlation_worker(group):
+    """Worker task streaming correlation histograms to one configuration group."""
+    p, stop, room = group["params"], group["stop"], group["room"]
+    payload = group["payload_template"]
+    # The Correlation is built once and kept alive across ticks (startFor()
+    # clears it each tick); it is only rebuilt after a measurement error
+    measurements = ExitStack()
+    corr = None
+
+    # Stay stoppable while the TimeTagger initializes (or if it never does)
+    while not hw.tagger_ready.wait(0.5):
+        if stop.is_set():
+            return
+    try:
+        while not stop.is_set():
+            try:
+                if corr is None:
+                    measurements = ExitStack()
+                    corr = measurements.enter_context(
+                        Correlation(hw.tagger, *p["ch"], p["bwidth"], p["nbins"])
+                    )
+                    # Bin positions only depend on the params.
+                    # Raw NumPy buffers are sent as Socket.IO binary attachments.
+                    tau = corr.getIndex()
+                    payload["tau_ps"] = tau.tobytes()
+                    payload["tau_dtype"] = str(tau.dtype)
+
+                corr.startFor(p["duration_ps"], clear=True)
+                corr.waitUntilFinished()
+                counts = corr.getData()
+            except Exception as e:
+                logger.warning(f"Correlation worker error: {e}")
+                measurements.close()
+                corr = None
+                socketio.sleep(1.0)
+                continue
 
-        try:
-            corr = Correlation(hw.tagger, *p["ch"], p["bwidth"], p["nbins"])
-            corr.startFor(int(p["rtime"] * 1e12))
-            corr.waitUntilFinished()
-            tau = corr.getIndex().tolist()
-            counts = corr.getData().tolist()
-        except Exception as e:
-            logger.warning(f"Correlation worker error: {e}")
-            socketio.sleep(1.0)
-            continue
+            # The last client may have left while we were measuring
+            if stop.is_set():
+                break
 
-        if version != state["version"]:
-            continue
+            payload["counts"] = counts.tobytes()
+            payload["counts_dtype"] = str(counts.dtype)
+            socketio.emit("correlation", payload, namespace=correlation_groups.namespace, to=room)
+    finally:
+        measurements.close()
 
-        socketio.emit(
-            "correlation",
-            {"status": 200, **p, "tau_ps": tau, "counts": counts},
-            namespace="/ws/timetagger/correlation",
-            to=sid
-        )
+correlation_groups = StreamGroups("corr", "/ws/timetagger/correlation", correlation_worker)
 
 @socketio.on("connect", namespace="/ws/timetagger/correlation")
 def corr_connect():
-    start_stream(correlation_clients, correlation_lock, request.sid, correlation_worker)
+    correlation_groups.connect(request.sid)
     emit("connected")
 
 @socketio.on("configure", namespace="/ws/timetagger/correlation")
@@ -782,8 +1202,7 @@ def corr_config(msg):
     """
     try:
         try:
-            ch_str = msg.get("ch", "")
-            ch1, ch2 = map(int, ch_str.split(","))
+            ch1, ch2 = validate_channels("ch", source=msg, required=True, count=2)
             bwidth = validate_arg("bwidth", int, source=msg, min_val=1000, max_val=10000, required=True)
             nbins = validate_arg("nbins", int, source=msg, min_val=10, max_val=100, required=True)
             rtime = validate_arg("rtime", float, source=msg, min_val=0.1, max_val=5.0, required=True)
@@ -791,15 +1210,24 @@ def corr_config(msg):
             emit("configured", {"status": 400, "error": str(e)})
             return
 
-        with correlation_lock:
-            s = correlation_clients[request.sid]
-            s["params"] = {
+        correlation_groups.join(
+            request.sid,
+            ((ch1, ch2), bwidth, nbins, rtime),
+            {
+                "ch": (ch1, ch2),
+                "bwidth": bwidth,
+                "nbins": nbins,
+                "rtime": rtime,
+                "duration_ps": int(rtime * 1e12)
+            },
+            payload_template={
+                "status": 200,
                 "ch": (ch1, ch2),
                 "bwidth": bwidth,
                 "nbins": nbins,
                 "rtime": rtime
             }
-            s["version"] += 1
+        )
         emit("configured", {"status": 200})
     except Exception as e:
         logger.exception("Error in correlation configure")
@@ -807,7 +1235,7 @@ def corr_config(msg):
 
 @socketio.on("disconnect", namespace="/ws/timetagger/correlation")
 def corr_disconnect():
-    stop_stream(correlation_clients, correlation_lock, request.sid)
+    correlation_groups.leave(request.sid)
 
 # =================================================
 # ================= SERVER START ==================
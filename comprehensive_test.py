@@ -1,25 +1,65 @@
 
-import requests
+import asyncio
+import httpx
 import socketio
-import threading
 import time
 import json
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used without it
+    orjson = None
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
 # Configuration
 BASE_URL = "http://localhost:5003"
 LOG_FILE = "test_results.txt"
+# Data frames to wait for after each (re)configuration before moving on
+FRAMES_PER_PHASE = 2
+# Fail fast instead of retrying when the server is not answering
+SOCKET_TIMEOUT_S = 2
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, mode='w'),
-        logging.StreamHandler()
-    ]
-)
+# Configure payloads are constants, built once at import instead of per call
+COUNTRATE_INITIAL = {"ch": "1,2", "rtime": 0.2}
+COUNTRATE_UPDATE = {"ch": "3,4", "rtime": 0.5}
+COUNTRATE_INVALID = {"ch": "1", "rtime": 10.0}  # Invalid rtime
+COINCIDENCE_INITIAL = {"groups": "1,2", "cwin": 1000, "rtime": 0.5}
+COINCIDENCE_UPDATE = {"groups": "3,4", "cwin": 2000, "rtime": 1.0}
+COINCIDENCE_INVALID = {"groups": "1,2", "cwin": 50, "rtime": 1.0}  # Invalid cwin
+CORRELATION_INITIAL = {"ch": "1,2", "bwidth": 1000, "nbins": 50, "rtime": 0.5}
+SOCKET_NAMESPACES = [
+    "/ws/timetagger/countrate",
+    "/ws/timetagger/coincidence",
+    "/ws/timetagger/correlation",
+]
+
+
+class _OrjsonCodec:
+    """json-module stand-in backed by orjson, for socketio's packet encoder."""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson output is already compact, so separators etc. are ignored
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
+
+
+SOCKET_JSON = _OrjsonCodec if orjson is not None else json
+
+# Setup logging: handlers only enqueue records; a listener thread does the I/O
+LOG_FORMATTER = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+_file_handler = logging.FileHandler(LOG_FILE, mode='w')
+_stream_handler = logging.StreamHandler()
+for _handler in (_file_handler, _stream_handler):
+    _handler.setFormatter(LOG_FORMATTER)
+log_q = queue.SimpleQueue()
+listener = QueueListener(log_q, _file_handler, _stream_handler)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_q)])
 logger = logging.getLogger("Tester")
 
 def log_section(title):
@@ -27,161 +67,220 @@ def log_section(title):
     logger.info(f"  {title}")
     logger.info("="*60)
 
-def test_rest_endpoint(method, endpoint, params=None, description=""):
+async def wait_event(evt, timeout):
+    """Wait until evt is set or timeout elapses, then clear it for the next phase."""
+    try:
+        await asyncio.wait_for(evt.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    evt.clear()
+
+async def test_rest_endpoint(client, method, endpoint, params=None, description=""):
     url = f"{BASE_URL}{endpoint}"
-    logger.info(f"REST TEST [{description}]")
-    logger.info(f"Request: {method} {url} Params={params}")
+    # Calls may run concurrently, so each test is logged as one record
+    lines = [
+        f"REST TEST [{description}]",
+        f"Request: {method} {url} Params={params}",
+    ]
     try:
         start_time = time.time()
         if method == "GET":
-            response = requests.get(url, params=params)
+            response = await client.get(url, params=params)
         elif method == "POST":
-            response = requests.post(url, json=params)
+            response = await client.post(url, json=params)
         duration = time.time() - start_time
         
-        logger.info(f"Response Status: {response.status_code}")
-        logger.info(f"Response Body: {response.text}")
-        logger.info(f"Duration: {duration:.3f}s")
+        lines.append(f"Response Status: {response.status_code}")
+        lines.append(f"Response Body: {response.text}")
+        lines.append(f"Duration: {duration:.3f}s")
         # Check standard error format
         if response.status_code == 200:
              try:
                  data = response.json()
                  if data.get("status") == 400:
-                      logger.info("-> Correctly handled soft error (status: 400)")
+                      lines.append("-> Correctly handled soft error (status: 400)")
                  elif data.get("status") == 200:
-                      logger.info("-> Success (status: 200)")
+                      lines.append("-> Success (status: 200)")
              except:
                  pass
+        logger.info("\n".join(lines))
         return response
     except Exception as e:
-        logger.error(f"Request failed: {e}")
+        lines.append(f"Request failed: {e}")
+        logger.error("\n".join(lines))
         return None
 
-def run_rest_suite():
+async def run_laser_sequence(client, calls):
+    """Laser calls depend on the previous switch state, so run them in order."""
+    return [await test_rest_endpoint(client, *call) for call in calls]
+
+async def run_rest_suite(client):
     log_section("STARTING REST API TESTS")
 
-    # 1. Countrate Tests
-    test_rest_endpoint("GET", "/timetagger/countrate", {"ch": "1,2", "rtime": 0.2}, "Valid Countrate (0.2s)")
-    test_rest_endpoint("GET", "/timetagger/countrate", {"ch": "1", "rtime": 0.05}, "Invalid Countrate (Too small: 0.05s)")
-    test_rest_endpoint("GET", "/timetagger/countrate", {"ch": "1", "rtime": 6.0}, "Invalid Countrate (Too large: 6.0s)")
+    # Independent TimeTagger calls: (method, endpoint, params, description)
+    timetagger_calls = [
+        # 1. Countrate Tests
+        ("GET", "/timetagger/countrate", {"ch": "1,2", "rtime": 0.2}, "Valid Countrate (0.2s)"),
+        ("GET", "/timetagger/countrate", {"ch": "1", "rtime": 0.05}, "Invalid Countrate (Too small: 0.05s)"),
+        ("GET", "/timetagger/countrate", {"ch": "1", "rtime": 6.0}, "Invalid Countrate (Too large: 6.0s)"),
 
-    # 2. Coincidence Tests
-    test_rest_endpoint("GET", "/timetagger/coincidence", {"groups": "1,2", "cwin": 2000, "rtime": 0.5}, "Valid Coincidence")
-    test_rest_endpoint("GET", "/timetagger/coincidence", {"groups": "1,2", "cwin": 100, "rtime": 0.5}, "Invalid Coincidence (Window too small)")
+        # 2. Coincidence Tests
+        ("GET", "/timetagger/coincidence", {"groups": "1,2", "cwin": 2000, "rtime": 0.5}, "Valid Coincidence"),
+        ("GET", "/timetagger/coincidence", {"groups": "1,2", "cwin": 100, "rtime": 0.5}, "Invalid Coincidence (Window too small)"),
 
-    # 3. Correlation Tests
-    test_rest_endpoint("GET", "/timetagger/correlation", {"ch": "1,2", "bwidth": 5000, "nbins": 50, "rtime": 0.5}, "Valid Correlation")
-    
-    # 4. Laser Tests
-    test_rest_endpoint("GET", "/laser/control", {"switch": 1, "power": 2.0}, "Laser ON Valid")
-    test_rest_endpoint("GET", "/laser/control", {"switch": 1, "power": 6.0}, "Laser ON Invalid Power (>5.0)")
-    test_rest_endpoint("GET", "/laser/control", {"switch": 0, "power": 2.0}, "Laser OFF with Power Param (Should fail)")
-    test_rest_endpoint("GET", "/laser/control", {"switch": 0}, "Laser OFF Valid")
+        # 3. Correlation Tests
+        ("GET", "/timetagger/correlation", {"ch": "1,2", "bwidth": 5000, "nbins": 50, "rtime": 0.5}, "Valid Correlation"),
+    ]
+
+    # 4. Laser Tests (order matters: ON, invalid ON, invalid OFF, OFF)
+    laser_calls = [
+        ("GET", "/laser/control", {"switch": 1, "power": 2.0}, "Laser ON Valid"),
+        ("GET", "/laser/control", {"switch": 1, "power": 6.0}, "Laser ON Invalid Power (>5.0)"),
+        ("GET", "/laser/control", {"switch": 0, "power": 2.0}, "Laser OFF with Power Param (Should fail)"),
+        ("GET", "/laser/control", {"switch": 0}, "Laser OFF Valid"),
+    ]
 
+    # All calls are I/O-bound; total time becomes the slowest call, not the sum
+    await asyncio.gather(
+        run_laser_sequence(client, laser_calls),
+        *(test_rest_endpoint(client, *call) for call in timetagger_calls),
+    )
 
-def socket_client_worker(client_id, namespace, initial_config, update_config_valid, update_config_invalid):
-    sio = socketio.Client()
-    results = []
+
+def attach_socket_client(sio, client_id, namespace, initial_config, update_config_valid, update_config_invalid):
+    """Register one client role's handlers on the shared sio; returns its test coroutine."""
+    configured_evt = asyncio.Event()
+    got_data = asyncio.Event()
+    frames = 0
+
+    def frame_received():
+        nonlocal frames
+        frames += 1
+        if frames >= FRAMES_PER_PHASE:
+            frames = 0
+            got_data.set()
     
     @sio.event(namespace=namespace)
-    def connect():
+    async def connect():
         logger.info(f"[Client {client_id}] Connected to {namespace}")
+        # 1. Initial Valid Configuration, sent as soon as the namespace is joined
+        logger.info(f"[Client {client_id}] Sending Initial Config: {initial_config}")
+        await sio.emit("configure", initial_config, namespace=namespace)
 
     @sio.event(namespace=namespace)
-    def configured(data):
+    async def configured(data):
         logger.info(f"[Client {client_id}] Configured response: {data}")
+        configured_evt.set()
 
     # Specific event handlers
     @sio.on("countrate", namespace=namespace)
-    def on_countrate(data):
+    async def on_countrate(data):
         logger.info(f"[Client {client_id}] Received Data: {data.keys()} rtime={data.get('rtime')}")
+        frame_received()
 
     @sio.on("coincidence", namespace=namespace)
-    def on_coincidence(data):
+    async def on_coincidence(data):
         logger.info(f"[Client {client_id}] Received Coincidence Data")
+        frame_received()
 
     @sio.on("correlation", namespace=namespace)
-    def on_correlation(data):
+    async def on_correlation(data):
          logger.info(f"[Client {client_id}] Received Correlation Data")
+         frame_received()
+
+    async def run():
+        nonlocal frames
+        try:
+            await asyncio.wait_for(configured_evt.wait(), SOCKET_TIMEOUT_S)
+            configured_evt.clear()
+            await wait_event(got_data, 2) # Wait for some data
+
+            # 2. Real-time Update (Valid)
+            if update_config_valid:
+                logger.info(f"[Client {client_id}] Sending Valid Update: {update_config_valid}")
+                frames = 0
+                got_data.clear()
+                await sio.emit("configure", update_config_valid, namespace=namespace)
+                await wait_event(got_data, 2)
+
+            # 3. Real-time Update (Invalid)
+            if update_config_invalid:
+                logger.info(f"[Client {client_id}] Sending Invalid Update: {update_config_invalid}")
+                configured_evt.clear()
+                await sio.emit("configure", update_config_invalid, namespace=namespace)
+                await wait_event(configured_evt, 1) # Should receive error response
+
+            logger.info(f"[Client {client_id}] Finished")
+        except asyncio.TimeoutError:
+            logger.error(f"[Client {client_id}] Error: not configured within {SOCKET_TIMEOUT_S}s")
+        except Exception as e:
+            logger.error(f"[Client {client_id}] Error: {e}")
+
+    return run
 
+async def run_socket_clients():
+    # One Engine.IO connection multiplexes all three namespaces
+    sio = socketio.AsyncClient(json=SOCKET_JSON, reconnection=False, request_timeout=SOCKET_TIMEOUT_S)
+    clients = [
+        # Client 1: Countrate
+        attach_socket_client(
+            sio,
+            "CountrateUser", 
+            "/ws/timetagger/countrate",
+            COUNTRATE_INITIAL,
+            COUNTRATE_UPDATE,
+            COUNTRATE_INVALID
+        ),
+        # Client 2: Coincidence
+        attach_socket_client(
+            sio,
+            "CoincidenceUser",
+            "/ws/timetagger/coincidence",
+            COINCIDENCE_INITIAL,
+            COINCIDENCE_UPDATE,
+            COINCIDENCE_INVALID
+        ),
+        # Client 3: Correlation (just one valid run)
+        attach_socket_client(
+            sio,
+            "CorrelationUser",
+            "/ws/timetagger/correlation",
+            CORRELATION_INITIAL,
+            None,
+            None
+        ),
+    ]
     try:
-        url = f"{BASE_URL}{namespace}"
-        logger.info(f"[Client {client_id}] Connecting...")
-        sio.connect(BASE_URL, namespaces=[namespace], wait=True)
-        
-        # 1. Initial Valid Configuration
-        logger.info(f"[Client {client_id}] Sending Initial Config: {initial_config}")
-        sio.emit("configure", initial_config, namespace=namespace)
-        time.sleep(2) # Wait for some data
-
-        # 2. Real-time Update (Valid)
-        if update_config_valid:
-            logger.info(f"[Client {client_id}] Sending Valid Update: {update_config_valid}")
-            sio.emit("configure", update_config_valid, namespace=namespace)
-            time.sleep(2)
-
-        # 3. Real-time Update (Invalid)
-        if update_config_invalid:
-            logger.info(f"[Client {client_id}] Sending Invalid Update: {update_config_invalid}")
-            sio.emit("configure", update_config_invalid, namespace=namespace)
-            time.sleep(1) # Should receive error response
-
-        sio.disconnect()
-        logger.info(f"[Client {client_id}] Disconnected")
+        logger.info("Connecting shared client...")
+        await sio.connect(BASE_URL, namespaces=SOCKET_NAMESPACES, wait=False)
+        await asyncio.gather(*(run() for run in clients))
     except Exception as e:
-        logger.error(f"[Client {client_id}] Error: {e}")
+        logger.error(f"Shared socket client error: {e}")
+    finally:
+        await sio.disconnect()
+        logger.info("Shared client disconnected")
 
-def run_socket_suite():
+async def run_socket_suite():
     log_section("STARTING SOCKET.IO MULTI-CLIENT TESTS")
-    
-    threads = []
-
-    # Client 1: Countrate
-    t1 = threading.Thread(target=socket_client_worker, args=(
-        "CountrateUser", 
-        "/ws/timetagger/countrate",
-        {"ch": "1,2", "rtime": 0.2},
-        {"ch": "3,4", "rtime": 0.5},
-        {"ch": "1", "rtime": 10.0} # Invalid rtime
-    ))
-    threads.append(t1)
-
-    # Client 2: Coincidence
-    t2 = threading.Thread(target=socket_client_worker, args=(
-        "CoincidenceUser",
-        "/ws/timetagger/coincidence",
-        {"groups": "1,2", "cwin": 1000, "rtime": 0.5},
-        {"groups": "3,4", "cwin": 2000, "rtime": 1.0},
-        {"groups": "1,2", "cwin": 50, "rtime": 1.0} # Invalid cwin
-    ))
-    threads.append(t2)
-
-    # Client 3: Correlation (just one valid run)
-    t3 = threading.Thread(target=socket_client_worker, args=(
-        "CorrelationUser",
-        "/ws/timetagger/correlation",
-        {"ch": "1,2", "bwidth": 1000, "nbins": 50, "rtime": 0.5},
-        None,
-        None
-    ))
-    threads.append(t3)
 
+    # All clients run as tasks on the same event loop and share one connection
     logger.info("Starting 3 concurrent socket clients...")
-    for t in threads:
-        t.start()
-    
-    for t in threads:
-        t.join()
+    await run_socket_clients()
     logger.info("All socket clients finished.")
 
+async def main():
+    # REST and socket suites share one event loop; the REST calls share one
+    # keep-alive connection pool
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        await asyncio.gather(run_rest_suite(client), run_socket_suite())
+
 if __name__ == "__main__":
+    listener.start()
     logger.info(f"Test Suite Started at {datetime.now()}")
     
-    # Run REST Tests
-    run_rest_suite()
-    
-    # Run Socket Tests
-    run_socket_suite()
+    asyncio.run(main())
     
     logger.info(f"Test Suite Completed at {datetime.now()}")
+    # Flush queued records before printing the summary
+    listener.stop()
     print(f"\nTests completed. Results saved to {LOG_FILE}")
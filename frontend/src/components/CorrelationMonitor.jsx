@@ -40,6 +40,20 @@ const CHANNEL_COLORS_LIGHT = [
     '#424242', // Dark Grey/Black
 ];
 
+// Typed-array views for the NumPy dtypes the server streams as raw bytes
+const TYPED_ARRAYS = {
+    int32: Int32Array,
+    int64: BigInt64Array,
+    float64: Float64Array,
+};
+
+// Decode a binary NumPy buffer into a plain array of Numbers
+const decodeArray = (buf, dtype) => {
+    const TypedArray = TYPED_ARRAYS[dtype];
+    if (!TypedArray || !(buf instanceof ArrayBuffer)) return null;
+    return Array.from(new TypedArray(buf), Number);
+};
+
 export default function CorrelationMonitor({ isLaserOn = false }) {
     const theme = useTheme();
     const [isRunning, setIsRunning] = useState(false);
@@ -78,8 +92,8 @@ export default function CorrelationMonitor({ isLaserOn = false }) {
 
             socketRef.current.on('correlation', (response) => {
                 if (response.status === 200) {
-                    const tau = response.tau_ps; // Array of time delays in ps
-                    const counts = response.counts; // Array of counts
+                    const tau = decodeArray(response.tau_ps, response.tau_dtype); // Time delays in ps
+                    const counts = decodeArray(response.counts, response.counts_dtype); // Counts per bin
 
                     // Zip into object array for Recharts: [{tau: -100, count: 5}, ...]
                     if (Array.isArray(tau) && Array.isArray(counts)) {
@@ -1,10 +1,16 @@
+import socket
 import websocket
 import sys
 
 try:
     # Note: socket.io handshake usually requires specific EIO param.
     # ws://localhost:5003/socket.io/?EIO=4&transport=websocket
-    ws = websocket.create_connection("ws://localhost:5003/socket.io/?EIO=4&transport=websocket")
+    # Disable Nagle so small frames are flushed immediately
+    ws = websocket.create_connection(
+        "ws://localhost:5003/socket.io/?EIO=4&transport=websocket",
+        sockopt=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+        timeout=2
+    )
     print("Connection successful")
     result = ws.recv()
     print(f"Received: {result}")
@@ -1,76 +1,80 @@
 
+import asyncio
 import socketio
 import time
-import threading
-import queue
 
 # Server URL
 URL = "http://localhost:5003"
 
-def run_client(namespace, config, event_name, result_queue, duration=5):
-    sio = socketio.Client()
+async def run_client(namespace, config, event_name, results_dict, duration=5, min_events=None):
+    sio = socketio.AsyncClient(reconnection=False, request_timeout=2)
     received_events = []
+    # Set once min_events have arrived, so the client can stop before duration
+    got_enough = asyncio.Event()
     
     @sio.on('connect', namespace=namespace)
-    def on_connect():
+    async def on_connect():
         print(f"[{namespace}] Connected")
-        sio.emit('configure', config, namespace=namespace)
+        await sio.emit('configure', config, namespace=namespace)
 
     @sio.on('configured', namespace=namespace)
-    def on_configured(data):
+    async def on_configured(data):
         print(f"[{namespace}] Configured: {data}")
 
     @sio.on(event_name, namespace=namespace)
-    def on_data(data):
-        print(f"[{namespace}] Data received at {time.time()}")
-        received_events.append(time.time())
+    async def on_data(data):
+        # Hot path is one clock read and an append; reporting happens later
+        received_events.append(time.monotonic_ns())
+        if min_events is not None and len(received_events) >= min_events:
+            got_enough.set()
 
     try:
-        sio.connect(URL, namespaces=[namespace])
-        time.sleep(duration)
-        sio.disconnect()
+        await sio.connect(URL, namespaces=[namespace], wait_timeout=2)
+        try:
+            await asyncio.wait_for(got_enough.wait(), duration)
+        except asyncio.TimeoutError:
+            pass
+        await sio.disconnect()
     except Exception as e:
         print(f"[{namespace}] Error: {e}")
     finally:
-        result_queue.put((namespace, received_events))
+        print(f"[{namespace}] {len(received_events)} data events received")
+        # Each client writes only its own key, so no synchronization is needed
+        results_dict[namespace] = received_events
 
-def verify_parallel():
-    q = queue.Queue()
-    
-    # Client 1: Countrate (1s window)
-    t1 = threading.Thread(target=run_client, args=(
-        "/ws/timetagger/countrate",
-        {"ch": "1,2", "rtime": 1.0},
-        "countrate",
-        q,
-        5 # Run for 5 seconds
-    ))
-
-    # Client 2: Correlation (1.5s window) - different window to avoid syncing by chance
-    t2 = threading.Thread(target=run_client, args=(
-        "/ws/timetagger/correlation", 
-        {"ch": "1,2", "bwidth": 1000, "nbins": 100, "rtime": 1.5},
-        "correlation",
-        q,
-        5
-    ))
+async def run_clients(results_dict):
+    await asyncio.gather(
+        # Client 1: Countrate (1s window)
+        run_client(
+            "/ws/timetagger/countrate",
+            {"ch": "1,2", "rtime": 1.0},
+            "countrate",
+            results_dict,
+            5, # Run for at most 5 seconds
+            3
+        ),
+        # Client 2: Correlation (1.5s window) - different window to avoid syncing by chance
+        run_client(
+            "/ws/timetagger/correlation", 
+            {"ch": "1,2", "bwidth": 1000, "nbins": 100, "rtime": 1.5},
+            "correlation",
+            results_dict,
+            5,
+            2
+        ),
+    )
 
-    start_time = time.time()
-    t1.start()
-    t2.start()
-    
-    t1.join()
-    t2.join()
-    
+def verify_parallel():
+    # Both clients run as tasks on a single event loop
     results = {}
-    while not q.empty():
-        ns, events = q.get()
-        results[ns] = events
+    start_ns = time.monotonic_ns()
+    asyncio.run(run_clients(results))
 
     print("\n--- Results ---")
     for ns, events in results.items():
         print(f"{ns}: {len(events)} events received")
-        print(f"Timestamps: {events}")
+        # Monotonic ns -> seconds since the clients were started
+        print(f"Timestamps (s): {[round((t - start_ns) / 1e9, 3) for t in events]}")
 
     # Analysis
     # If sequential, we expect Client 1 to block Client 2 or vice versa.